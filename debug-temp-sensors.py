@@ -5,25 +5,73 @@ Run this directly on the system where temperature sensors aren't working.
 """
 
 import os
+import io
 import sys
+import argparse
 import glob
+import shutil
 import subprocess
 import platform
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class SectionOutput:
+    """Stand-in for sys.stdout that sends writes from section threads to per-thread buffers"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+    
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.stream).write(text)
+    
+    def flush(self):
+        self.stream.flush()
+
+def run_sections(sections, max_workers=4):
+    """Run independent diagnostic sections concurrently and print their output in order"""
+    output = SectionOutput(sys.stdout)
+    
+    def capture(func, args):
+        output.local.buffer = io.StringIO()
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"Error in {func.__name__}: {e}")
+        finally:
+            text = output.local.buffer.getvalue()
+            del output.local.buffer
+        return text
+    
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(capture, func, args) for func, *args in sections]
+            for future in futures:
+                output.stream.write(future.result())
+                output.stream.flush()
+    finally:
+        sys.stdout = output.stream
 
 def print_section(title):
     print("\n" + "=" * 50)
     print(f" {title}")
     print("=" * 50)
 
+def get_loaded_modules():
+    """Return the names of loaded kernel modules from /proc/modules"""
+    with open('/proc/modules', 'r') as f:
+        return {line.split(None, 1)[0] for line in f if line.strip()}
+
 def check_kernel_modules():
     print_section("Checking temperature-related kernel modules")
     try:
-        lsmod_output = subprocess.check_output(['lsmod'], universal_newlines=True)
+        loaded_modules = get_loaded_modules()
         modules_to_check = ['coretemp', 'k10temp', 'intel_powerclamp', 'thermal', 'acpi_thermal_rel']
         
         found_modules = []
         for module in modules_to_check:
-            if module in lsmod_output:
+            if module in loaded_modules:
                 found_modules.append(module)
                 print(f"✅ {module} module is loaded")
             else:
@@ -43,14 +91,25 @@ def check_kernel_modules():
 def list_available_modules():
     print_section("Available temperature modules")
     try:
-        kernel_version = subprocess.check_output(['uname', '-r'], universal_newlines=True).strip()
-        module_paths = subprocess.check_output(
-            ['find', f'/lib/modules/{kernel_version}', '-name', '*temp*.ko*'], 
-            stderr=subprocess.STDOUT,
-            universal_newlines=True
-        ).strip().split('\n')
+        kernel_version = os.uname().release
+        modules_root = f'/lib/modules/{kernel_version}'
+        if not os.path.isdir(modules_root):
+            print(f"❌ {modules_root} directory does not exist")
+            return
         
-        if module_paths and module_paths[0]:
+        # Collect temperature and thermal modules in a single walk of the module tree
+        module_paths = []
+        thermal_paths = []
+        for dirpath, dirs, files in os.walk(modules_root):
+            for file in files:
+                if '.ko' not in file:
+                    continue
+                if 'temp' in file:
+                    module_paths.append(os.path.join(dirpath, file))
+                if 'thermal' in file:
+                    thermal_paths.append(os.path.join(dirpath, file))
+        
+        if module_paths:
             print(f"Found {len(module_paths)} temperature-related modules:")
             for path in module_paths:
                 print(f"  → {path}")
@@ -58,13 +117,7 @@ def list_available_modules():
             print("No temperature modules found in kernel modules directory")
         
         # Also check thermal modules
-        thermal_paths = subprocess.check_output(
-            ['find', f'/lib/modules/{kernel_version}', '-name', '*thermal*.ko*'], 
-            stderr=subprocess.STDOUT,
-            universal_newlines=True
-        ).strip().split('\n')
-        
-        if thermal_paths and thermal_paths[0]:
+        if thermal_paths:
             print(f"\nFound {len(thermal_paths)} thermal-related modules:")
             for path in thermal_paths:
                 print(f"  → {path}")
@@ -72,6 +125,44 @@ def list_available_modules():
     except Exception as e:
         print(f"Error listing available modules: {e}")
 
+def read_sysfs(path, size=64):
+    """Read a small sysfs/procfs attribute with a single unbuffered read"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+# Some driver-backed thermal zones (e.g. iwlwifi) can take a long time to answer a read
+THERMAL_READ_TIMEOUT = 0.2  # seconds
+
+def read_sysfs_with_timeout(path, timeout, size=64):
+    """Read a sysfs attribute, raising TimeoutError if the read takes longer than timeout.
+
+    The read runs in a daemon thread so a zone that never answers cannot keep
+    the tool from exiting.
+    """
+    result = {}
+    
+    def reader():
+        try:
+            result['data'] = read_sysfs(path, size)
+        except Exception as e:
+            result['error'] = e
+    
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"reading {path} took longer than {timeout}s")
+    if 'error' in result:
+        raise result['error']
+    return result['data']
+
+def read_sysfs_text(path, size=64):
+    """Read a small sysfs/procfs attribute as stripped text"""
+    return read_sysfs(path, size).decode(errors='replace').strip()
+
 def scan_hwmon_devices():
     print_section("Scanning hwmon devices")
     
@@ -81,39 +172,35 @@ def scan_hwmon_devices():
             print(f"❌ {hwmon_base} directory does not exist")
             return
             
-        hwmon_devices = os.listdir(hwmon_base)
+        hwmon_devices = list(os.scandir(hwmon_base))
         print(f"Found {len(hwmon_devices)} hwmon devices")
         
         for device in hwmon_devices:
-            device_path = os.path.join(hwmon_base, device)
-            print(f"\nChecking device: {device_path}")
+            print(f"\nChecking device: {device.path}")
+            
+            # List the device directory once and look up attributes in it
+            entries = {e.name: e for e in os.scandir(device.path)}
             
             # Try to get device name
-            name_path = os.path.join(device_path, "name")
             device_name = "Unknown"
-            if os.path.exists(name_path):
-                with open(name_path, 'r') as f:
-                    device_name = f.read().strip()
+            if "name" in entries:
+                device_name = read_sysfs_text(entries["name"].path)
             
             print(f"  Device name: {device_name}")
             
             # Look for temperature inputs
-            temp_files = [f for f in os.listdir(device_path) if f.startswith("temp") and f.endswith("_input")]
+            temp_files = [n for n in entries if n.startswith("temp") and n.endswith("_input")]
             if temp_files:
                 print(f"  ✅ Found {len(temp_files)} temperature sensors")
                 
                 for temp_file in temp_files:
-                    temp_path = os.path.join(device_path, temp_file)
-                    with open(temp_path, 'r') as f:
-                        temp_value = float(f.read().strip()) / 1000.0
+                    temp_value = int(read_sysfs(entries[temp_file].path)) / 1000.0
                     
                     # Check for label
                     label = "N/A"
                     label_file = temp_file.replace("_input", "_label")
-                    label_path = os.path.join(device_path, label_file)
-                    if os.path.exists(label_path):
-                        with open(label_path, 'r') as f:
-                            label = f.read().strip()
+                    if label_file in entries:
+                        label = read_sysfs_text(entries[label_file].path)
                     
                     print(f"    → {temp_file}: {temp_value}°C (Label: {label})")
             else:
@@ -130,33 +217,34 @@ def check_thermal_zones():
             print(f"❌ {thermal_base} directory does not exist")
             return
             
-        thermal_zones = [d for d in os.listdir(thermal_base) if d.startswith("thermal_zone")]
+        thermal_zones = [e for e in os.scandir(thermal_base) if e.name.startswith("thermal_zone")]
         print(f"Found {len(thermal_zones)} thermal zones")
         
         for zone in thermal_zones:
-            zone_path = os.path.join(thermal_base, zone)
-            print(f"\nChecking zone: {zone_path}")
+            print(f"\nChecking zone: {zone.path}")
+            
+            # List the zone directory once and look up attributes in it
+            contents = {e.name: e for e in os.scandir(zone.path)}
             
             # Get zone type
-            type_path = os.path.join(zone_path, "type")
             zone_type = "Unknown"
-            if os.path.exists(type_path):
-                with open(type_path, 'r') as f:
-                    zone_type = f.read().strip()
+            if "type" in contents:
+                zone_type = read_sysfs_text(contents["type"].path)
             
             print(f"  Zone type: {zone_type}")
             
             # Get temperature
-            temp_path = os.path.join(zone_path, "temp")
-            if os.path.exists(temp_path):
-                with open(temp_path, 'r') as f:
-                    try:
-                        temp_value = float(f.read().strip()) / 1000.0
-                        print(f"  Temperature: {temp_value}°C")
-                    except ValueError:
-                        print(f"  Error reading temperature: invalid value")
-            else:
+            if "temp" not in contents:
                 print("  ❌ No temperature reading available")
+                continue
+            
+            try:
+                temp_value = int(read_sysfs_with_timeout(contents["temp"].path, THERMAL_READ_TIMEOUT)) / 1000.0
+                print(f"  Temperature: {temp_value}°C")
+            except TimeoutError:
+                print(f"  Temperature: skipped (no response within {THERMAL_READ_TIMEOUT}s)")
+            except ValueError:
+                print(f"  Error reading temperature: invalid value")
     except Exception as e:
         print(f"Error checking thermal zones: {e}")
 
@@ -199,9 +287,7 @@ def check_lm_sensors():
     
     try:
         # Check if sensors command exists
-        try:
-            subprocess.check_output(['which', 'sensors'], stderr=subprocess.STDOUT)
-        except subprocess.CalledProcessError:
+        if shutil.which('sensors') is None:
             print("❌ 'sensors' command not found")
             print("\nTry installing lm-sensors:")
             print("  sudo apt-get install lm-sensors")
@@ -228,69 +314,88 @@ def check_system_info():
         print(f"Processor: {platform.processor()}")
         print(f"Kernel: {os.uname().release}")
         
-        # Get CPU model from /proc/cpuinfo
+        # Get CPU model from /proc/cpuinfo (the first processor block is enough)
         try:
-            with open('/proc/cpuinfo', 'r') as f:
-                for line in f:
-                    if line.startswith('model name'):
-                        print(f"CPU Model: {line.split(':', 1)[1].strip()}")
-                        break
+            cpuinfo = read_sysfs('/proc/cpuinfo', 4096)
+            start = cpuinfo.find(b'model name')
+            if start != -1:
+                end = cpuinfo.find(b'\n', start)
+                line = cpuinfo[start:end if end != -1 else len(cpuinfo)]
+                print(f"CPU Model: {line.split(b':', 1)[1].strip().decode(errors='replace')}")
         except:
             pass
             
         # Try to get system product name
         try:
-            with open('/sys/class/dmi/id/product_name', 'r') as f:
-                print(f"Product Name: {f.read().strip()}")
+            print(f"Product Name: {read_sysfs_text('/sys/class/dmi/id/product_name')}")
         except:
             pass
             
         # Try to get system manufacturer
         try:
-            with open('/sys/class/dmi/id/sys_vendor', 'r') as f:
-                print(f"Manufacturer: {f.read().strip()}")
+            print(f"Manufacturer: {read_sysfs_text('/sys/class/dmi/id/sys_vendor')}")
         except:
             pass
     except Exception as e:
         print(f"Error getting system info: {e}")
 
-def check_proc_temperatures():
+# Known locations of temperature data under /proc
+PROC_TEMPERATURE_PATTERNS = [
+    "/proc/acpi/thermal_zone/*/temperature",
+]
+
+def find_proc_temperature_files(deep=False):
+    """Return temperature-related files under /proc.
+
+    By default only the known ACPI locations are checked. With deep=True the
+    whole /proc tree is walked, which is slow on busy hosts.
+    """
+    if not deep:
+        temp_files = []
+        for pattern in PROC_TEMPERATURE_PATTERNS:
+            temp_files.extend(glob.glob(pattern))
+        return temp_files
+    
+    # Exclude IPv6 configuration which has "temp" in the name but is unrelated
+    temp_files = []
+    for root, dirs, files in os.walk("/proc"):
+        # Skip IPv6 configuration directories
+        if "ipv6/conf" in root:
+            continue
+            
+        for file in files:
+            if "temp" in file.lower() and not file.startswith("temp_"):
+                temp_files.append(os.path.join(root, file))
+    return temp_files
+
+def check_proc_temperatures(deep=False):
     print_section("Checking /proc for temperature data")
     
     try:
         # Some systems have CPU temperature here
         if os.path.exists("/proc/acpi/ibm/thermal"):
             print("ThinkPad-specific thermal data:")
-            with open("/proc/acpi/ibm/thermal", 'r') as f:
-                print(f.read())
+            print(read_sysfs("/proc/acpi/ibm/thermal", 4096).decode(errors='replace'))
         else:
             print("No ThinkPad-specific thermal data available")
             
         # Check for other temperature sources in /proc
-        # Exclude IPv6 configuration which has "temp" in the name but is unrelated
-        temp_files = []
-        for root, dirs, files in os.walk("/proc"):
-            # Skip IPv6 configuration directories
-            if "ipv6/conf" in root:
-                continue
-                
-            for file in files:
-                if "temp" in file.lower() and not file.startswith("temp_"):
-                    temp_files.append(os.path.join(root, file))
+        temp_files = find_proc_temperature_files(deep)
         
         if temp_files:
             print(f"\nFound {len(temp_files)} potential temperature-related files in /proc:")
             for file in temp_files[:10]:  # Limit to first 10 to avoid excessive output
                 print(f"  {file}")
                 try:
-                    with open(file, 'r') as f:
-                        content = f.read().strip()
-                        if len(content) < 100:  # Only print short content
-                            print(f"    Content: {content}")
+                    content = read_sysfs_text(file, 4096)
+                    if len(content) < 100:  # Only print short content
+                        print(f"    Content: {content}")
                 except Exception:
                     pass
         else:
             print("No temperature-related files found in /proc")
+            if not deep:
+                print("Run with --deep to search the whole /proc tree")
     except Exception as e:
         print(f"Error checking /proc temperatures: {e}")
 
@@ -320,6 +425,11 @@ def suggest_next_steps():
     print("   sudo rdmsr --all")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Temperature sensor diagnostic tool")
+    parser.add_argument("--deep", action="store_true",
+                        help="Search the entire /proc tree for temperature files (slow)")
+    args = parser.parse_args()
+    
     print("Temperature Sensor Diagnostic Tool")
     print("=================================")
     
@@ -328,13 +438,19 @@ if __name__ == "__main__":
         sys.exit(1)
     
     check_system_info()
-    check_kernel_modules()
-    list_available_modules()
-    scan_hwmon_devices()
-    check_thermal_zones()
-    check_acpi_thermal()
-    check_lm_sensors()
-    check_proc_temperatures()
+    
+    # These sections are independent and mostly wait on subprocesses or sysfs,
+    # so run them concurrently; output is still printed in this order
+    run_sections([
+        (check_kernel_modules,),
+        (list_available_modules,),
+        (scan_hwmon_devices,),
+        (check_thermal_zones,),
+        (check_acpi_thermal,),
+        (check_lm_sensors,),
+        (check_proc_temperatures, args.deep),
+    ])
+    
     suggest_next_steps()
     
     print("\nDiagnostic completed. Please share this output with the developer.")
@@ -9,12 +9,76 @@ import configparser
 import subprocess
 import re
 import uuid
+import functools
 from pathlib import Path
 
 
+# Platform name, looked up once
+SYSTEM = platform.system()
+
+# Mount points on macOS that are virtual/system volumes rather than real drives
+MACOS_SKIP_PATTERNS = (
+    '/Library/Developer/CoreSimulator',
+    '/Volumes/com.apple',
+    '/private/var/vm',
+    '/System/Volumes/VM',
+    '/System/Volumes/Preboot',
+    '/System/Volumes/Data',
+    '/System/Volumes/Update',
+    'TimeMachine'
+)
+
+# Device name patterns used to guess the drive type on Linux
+SSD_DEVICE_RE = re.compile(r'nvme|ssd', re.IGNORECASE)
+HDD_DEVICE_RE = re.compile(r'(?:^|/)[sh]d[a-z]', re.IGNORECASE)
+
+# Allowed characters for the system short name
+SHORTNAME_RE = re.compile(r'\A[a-zA-Z0-9_\- ]+\Z')
+
+
 def is_valid_shortname(name):
     """Check if the short name is valid (allowing alphanumeric, spaces, underscores and hyphens)"""
-    return bool(re.match(r'^[a-zA-Z0-9_\- ]+$', name))
+    return SHORTNAME_RE.match(name) is not None
+
+
+def get_total_bytes(mountpoint):
+    """Get the total size of the filesystem mounted at mountpoint"""
+    if hasattr(os, 'statvfs'):
+        st = os.statvfs(mountpoint)
+        return st.f_blocks * st.f_frsize
+    # Windows has no statvfs
+    return psutil.disk_usage(mountpoint).total
+
+
+@functools.lru_cache(maxsize=64)
+def get_rotational_device_type(device):
+    """Read SSD/HDD from the sysfs rotational flag of a Linux block device, or None"""
+    name = os.path.basename(os.path.realpath(device))
+    # Partitions have no queue directory of their own; their parent disk does
+    for path in (f'/sys/class/block/{name}/queue/rotational',
+                 f'/sys/class/block/{name}/../queue/rotational'):
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            flag = os.read(fd, 2)
+        finally:
+            os.close(fd)
+        return "HDD" if flag.startswith(b'1') else "SSD"
+    return None
+
+
+def get_linux_device_type(device):
+    """Get SSD/HDD for a Linux block device, guessing from its name if sysfs has no answer"""
+    device_type = get_rotational_device_type(device)
+    if device_type:
+        return device_type
+    if SSD_DEVICE_RE.search(device):
+        return "SSD"
+    elif HDD_DEVICE_RE.search(device):
+        return "HDD"
+    return "unknown"
 
 
 def get_storage_devices():
@@ -28,20 +92,11 @@ def get_storage_devices():
         partitions = psutil.disk_partitions(all=False)
         
         # macOS specific filtering
-        if platform.system() == 'Darwin':
+        if SYSTEM == 'Darwin':
             filtered_partitions = []
             for p in partitions:
                 # Skip virtual/system partitions on macOS
-                if any(skip_pattern in p.mountpoint for skip_pattern in [
-                    '/Library/Developer/CoreSimulator',
-                    '/Volumes/com.apple',
-                    '/private/var/vm',
-                    '/System/Volumes/VM',
-                    '/System/Volumes/Preboot',
-                    '/System/Volumes/Data',
-                    '/System/Volumes/Update',
-                    'TimeMachine'
-                ]):
+                if any(skip_pattern in p.mountpoint for skip_pattern in MACOS_SKIP_PATTERNS):
                     continue
                     
                 # Only include root volume and real Volumes
@@ -49,25 +104,26 @@ def get_storage_devices():
                     filtered_partitions.append(p)
                     
             partitions = filtered_partitions
+        
+        # Pick the device type classifier once for this platform
+        if SYSTEM == 'Linux':
+            get_device_type = get_linux_device_type
+        elif SYSTEM == 'Darwin':
+            get_device_type = lambda device: "SSD"
+        else:
+            get_device_type = lambda device: "unknown"
             
         # Process partitions
         for i, partition in enumerate(partitions):
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
+                total = get_total_bytes(partition.mountpoint)
                 
                 # Skip small partitions
-                if usage.total < 1e9:  # Less than 1GB
+                if total < 1e9:  # Less than 1GB
                     continue
                     
                 # Get device type
-                if platform.system() == 'Linux':
-                    device_type = "unknown"
-                    if 'nvme' in partition.device.lower() or 'ssd' in partition.device.lower():
-                        device_type = "SSD"
-                    elif 'sd' in partition.device.lower() or 'hd' in partition.device.lower():
-                        device_type = "HDD"
-                else:
-                    device_type = "SSD" if platform.system() == 'Darwin' else "unknown"
+                device_type = get_device_type(partition.device)
                 
                 # Add to list
                 storage_devices.append({
@@ -75,11 +131,12 @@ def get_storage_devices():
                     'mountpoint': partition.mountpoint,
                     'device': partition.device,
                     'fstype': partition.fstype,
-                    'size_gb': round(usage.total / (1024**3), 2),
+                    'size_gb': round(total / (1024**3), 2),
                     'type': device_type
                 })
                 
-            except PermissionError:
+            except OSError:
+                # Unreadable or unreachable mount (permissions, stale NFS, ejected media)
                 continue
                 
     except Exception as e:
@@ -139,7 +196,7 @@ def generate_config():
     config = configparser.ConfigParser()
     
     # Clear screen
-    os.system('cls' if platform.system() == 'Windows' else 'clear')
+    os.system('cls' if SYSTEM == 'Windows' else 'clear')
     
     print("=" * 70)
     print("             System Monitor Configuration Generator")
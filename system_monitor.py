@@ -1,5 +1,6 @@
 # system_monitor_client.py
 
+import argparse
 import asyncio
 import websockets
 import json
@@ -10,13 +11,24 @@ import uuid
 import time
 import logging
 import re
+import random
 import sys
 import os
 import subprocess
+import threading
+import functools
+import traceback
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import configparser
 
+try:
+    import orjson
+except ImportError:  # optional, falls back to the standard json module
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,6 +44,39 @@ logger = logging.getLogger('system_monitor_client')
 WEBSOCKET_URL = "ws://ghoest:8000/ws/system/metrics/"
 CLIENT_ID_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "client_id.txt")
 HOSTNAME = socket.gethostname()
+SYSTEM = platform.system()
+MACHINE = platform.machine()
+# Default executor size for asyncio.to_thread calls (registration probes, partition
+# listing); calls that can hang, like disk_usage, go through start_guarded instead
+BLOCKING_WORKER_THREADS = 4
+# Collected samples waiting to be sent; the oldest are dropped if the link stalls
+METRICS_QUEUE_SIZE = 32
+# Leave a metrics subsystem out of a tick if its read takes longer than this (seconds)
+METRICS_COLLECT_TIMEOUT = 8
+# Skip partitions whose disk_usage hasn't returned within this many seconds
+DISK_USAGE_TIMEOUT = 5
+
+def _json_default(obj):
+    """Serialize datetimes the same way orjson does for the json fallback"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def encode_message(message):
+    """Serialize a message to JSON for sending as a text frame
+
+    Timestamps may be passed as datetime objects; they are written as ISO 8601
+    strings by the encoder rather than formatted in Python on every send.
+    """
+    if orjson:
+        return orjson.dumps(message)
+    return json.dumps(message, default=_json_default)
+
+def decode_message(data):
+    """Parse a JSON message received from the server"""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
 
 # Add this function to read the configuration file
 def read_config():
@@ -87,22 +132,124 @@ def get_client_id():
 # Initialize client ID
 CLIENT_ID = get_client_id()
 
+# Hardware and OS details that don't change while the client is running
+CPU_CORES = psutil.cpu_count(logical=True)
+RAM_TOTAL = psutil.virtual_memory().total
+BOOT_TIME = psutil.boot_time()
+OS_VERSION = f"{SYSTEM} {platform.release()}"
+
+# Message fields that are the same for every message of a type
+SYSTEM_CONFIG = CONFIG['system'] if CONFIG and 'system' in CONFIG else {}
+REGISTRATION_ENVELOPE = {
+    "type": "register_host",
+    "hostname": HOSTNAME,
+    "client_id": CLIENT_ID,
+    "short_name": SYSTEM_CONFIG.get('short_name', ""),
+    "description": SYSTEM_CONFIG.get('description', ""),
+}
+METRICS_ENVELOPE = {
+    "type": "metrics_update",
+    "hostname": HOSTNAME,
+}
+PING_ENVELOPE = {
+    "type": "ping",
+}
+
+# Prime psutil's CPU counters so later non-blocking cpu_percent() calls
+# report usage since the previous call instead of 0.0
+psutil.cpu_percent(interval=None)
+
+def async_cache(func):
+    """Memoize the results of a coroutine function by its positional arguments"""
+    cache = {}
+    
+    @functools.wraps(func)
+    async def wrapper(*args):
+        if args not in cache:
+            cache[args] = await func(*args)
+        return cache[args]
+    return wrapper
+
+# Keys of guarded blocking calls that haven't returned yet
+_in_flight = set()
+
+def start_guarded(key, func, *args):
+    """Run a blocking call in a daemon thread unless the previous call for key is still running
+
+    Returns an asyncio future for the result, or None if the earlier call for the
+    same key hasn't returned. A call stuck in the kernel (e.g. statvfs on a dead
+    network mount) can't be cancelled, so this keeps it to a single thread instead
+    of one more per tick, and being a daemon thread it can't block exit.
+    """
+    if key in _in_flight:
+        return None
+    _in_flight.add(key)
+    
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    # Callers may stop waiting before the call returns; retrieve late exceptions
+    # so asyncio doesn't report them as never retrieved
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    
+    def settle(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def target():
+        result = error = None
+        try:
+            result = func(*args)
+        except Exception as e:
+            error = e
+        finally:
+            _in_flight.discard(key)
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError:
+            pass  # Event loop already closed
+    
+    threading.Thread(target=target, name=f"guarded-{key}", daemon=True).start()
+    return future
+
+async def run_command(cmd, merge_stderr=False):
+    """Run a command without blocking the event loop and return its decoded stdout"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT if merge_stderr else None
+    )
+    output, _ = await process.communicate()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, cmd, output)
+    return output.decode('utf-8')
+
 async def collect_system_info():
     """Collect basic system information"""
     try:
+        # Run the CPU and GPU probes and the IP lookup (which may hit DNS) concurrently
+        cpu_model, gpu_model, ip_address = await asyncio.gather(
+            get_cpu_model(),
+            get_gpu_info(),
+            asyncio.to_thread(get_primary_ip)
+        )
+        
         info = {
             "hostname": HOSTNAME,
             "client_id": CLIENT_ID,
             "system_type": determine_system_type(),
-            "cpu_model": get_cpu_model(),
-            "cpu_cores": psutil.cpu_count(logical=True),
-            "ram_total": psutil.virtual_memory().total,
-            "os_version": f"{platform.system()} {platform.release()}",
-            "ip_address": get_primary_ip(),
+            "cpu_model": cpu_model,
+            "cpu_cores": CPU_CORES,
+            "ram_total": RAM_TOTAL,
+            "os_version": OS_VERSION,
+            "ip_address": ip_address,
         }
         
         # Add GPU info
-        info['gpu_model'] = get_gpu_info()
+        info['gpu_model'] = gpu_model
         
         # Add information from config file if available
         if CONFIG and 'system' in CONFIG:
@@ -116,19 +263,24 @@ async def collect_system_info():
         logger.error(f"Error collecting system info: {e}")
         return {"hostname": HOSTNAME, "system_type": determine_system_type()}
 
-def get_cpu_model():
+@async_cache
+async def get_cpu_model():
     """Get a more descriptive CPU model name"""
     try:
-        if platform.system() == 'Linux':
-            with open('/proc/cpuinfo', 'r') as f:
-                for line in f:
-                    if line.startswith('model name'):
-                        return line.split(':', 1)[1].strip()
+        if SYSTEM == 'Linux':
+            # "model name" is in the first processor block, so a bounded read is enough
+            with open('/proc/cpuinfo', 'rb', buffering=0) as f:
+                cpuinfo = f.read(4096)
+            start = cpuinfo.find(b'model name')
+            if start != -1:
+                end = cpuinfo.find(b'\n', start)
+                line = cpuinfo[start:end if end != -1 else len(cpuinfo)]
+                return line.split(b':', 1)[1].strip().decode('utf-8', errors='replace')
             # Fallback
             return platform.processor()
-        elif platform.system() == 'Darwin':  # macOS
+        elif SYSTEM == 'Darwin':  # macOS
             cmd = ['sysctl', '-n', 'machdep.cpu.brand_string']
-            return subprocess.check_output(cmd).decode('utf-8').strip()
+            return (await run_command(cmd)).strip()
         else:
             return platform.processor()
     except:
@@ -137,62 +289,93 @@ def get_cpu_model():
 def get_primary_ip():
     """Get the primary IP address"""
     try:
-        # This gets the IP used to connect to the internet
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-        return ip
+        # This gets the IP used to connect to the internet. Connecting a UDP socket
+        # only performs a local route lookup; no packets are sent.
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
     except:
         # Fallback
         return socket.gethostbyname(socket.gethostname())
 
-def get_gpu_info():
+# PCI class codes for VGA, 3D and other display controllers
+DISPLAY_PCI_CLASSES = ('0300', '0302', '0380')
+
+# A line of `lspci -mm -nn` output: slot "class [code]" "vendor [id]" "device [id]" ...
+LSPCI_DISPLAY_RE = re.compile(r'^\S+ "[^"]*\[([0-9a-f]{4})\]" "([^"]*)" "([^"]*)"')
+
+# Trailing numeric PCI ID added by `lspci -nn`, e.g. " [10de]"
+PCI_ID_SUFFIX_RE = re.compile(r'\s*\[[0-9a-f]{4}\]$')
+
+# Short vendor names for the GPU model string
+GPU_VENDOR_NAMES = (
+    ('NVIDIA', 'NVIDIA'),
+    ('AMD', 'AMD'),
+    ('ATI', 'AMD'),
+    ('Intel', 'Intel'),
+)
+
+def format_gpu_name(vendor, device):
+    """Build a readable GPU name from lspci vendor and device fields"""
+    vendor = PCI_ID_SUFFIX_RE.sub('', vendor)
+    device = PCI_ID_SUFFIX_RE.sub('', device)
+    
+    # Prefer the marketing name in brackets, e.g. "GP104 [GeForce GTX 1080]"
+    if device.endswith(']') and '[' in device:
+        device = device[device.rindex('[') + 1:-1]
+    
+    for marker, short_name in GPU_VENDOR_NAMES:
+        if marker in vendor:
+            return f"{short_name} {device}"
+    return f"{vendor} {device}"
+
+@async_cache
+async def get_gpu_info():
     """Get GPU information in a more robust way"""
     try:
-        if platform.system() == 'Linux':
-            # Try lspci first for AMD and NVIDIA cards
+        if SYSTEM == 'Linux':
+            # Try lspci first, filtering display controllers by PCI class code
             try:
-                cmd = ['lspci', '-v']
-                output = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode('utf-8')
+                cmd = ['lspci', '-mm', '-nn']
+                output = await run_command(cmd, merge_stderr=True)
                 
-                # Look for graphics cards
-                for line in output.split('\n'):
-                    if re.search(r'VGA|3D|Display|Graphics', line, re.IGNORECASE):
-                        # Get the GPU model from the line
-                        if "AMD" in line or "ATI" in line or "Radeon" in line:
-                            match = re.search(r'.*?:\s(AMD|ATI).*?(Radeon[^[]*)', line)
-                            if match:
-                                return match.group(2).strip()
-                        elif "NVIDIA" in line:
-                            match = re.search(r'.*?:\sNVIDIA\s(.*?)\s[\[(]', line)
-                            if match:
-                                return f"NVIDIA {match.group(1).strip()}"
+                discrete_gpus = []
+                other_gpus = []
+                for line in output.splitlines():
+                    match = LSPCI_DISPLAY_RE.match(line)
+                    if not match:
+                        continue
+                    pci_class, vendor, device = match.groups()
+                    if pci_class not in DISPLAY_PCI_CLASSES:
+                        continue
+                    
+                    gpu_name = format_gpu_name(vendor, device)
+                    # Prefer discrete AMD/NVIDIA cards over integrated graphics
+                    if gpu_name.startswith(('AMD', 'NVIDIA')):
+                        discrete_gpus.append(gpu_name)
+                    else:
+                        other_gpus.append(gpu_name)
                 
-                # Second pass for Intel graphics
-                for line in output.split('\n'):
-                    if "Intel" in line and re.search(r'VGA|3D|Display|Graphics', line, re.IGNORECASE):
-                        match = re.search(r'.*?:\s(Intel.*?)\s[\[(]', line)
-                        if match:
-                            return match.group(1).strip()
+                if discrete_gpus or other_gpus:
+                    return ", ".join(discrete_gpus + other_gpus)
             except:
                 pass
                 
             # Fallback to glxinfo for Linux
             try:
                 cmd = ['glxinfo', '-B']
-                output = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode('utf-8')
-                for line in output.split('\n'):
+                output = await run_command(cmd, merge_stderr=True)
+                for line in output.splitlines():
                     if 'OpenGL renderer string' in line:
                         return line.split(':', 1)[1].strip()
             except:
                 pass
                 
-        elif platform.system() == 'Darwin':  # macOS
+        elif SYSTEM == 'Darwin':  # macOS
             try:
                 cmd = ['system_profiler', 'SPDisplaysDataType']
-                output = subprocess.check_output(cmd).decode('utf-8')
-                for line in output.split('\n'):
+                output = await run_command(cmd)
+                for line in output.splitlines():
                     if 'Chipset Model:' in line:
                         return line.split(':', 1)[1].strip()
             except:
@@ -204,11 +387,12 @@ def get_gpu_info():
         logger.error(f"Error getting GPU info: {e}")
         return "Unknown GPU"
 
+@functools.lru_cache(maxsize=None)
 def determine_system_type():
     """Determine the system type based on the platform"""
-    system = platform.system().lower()
+    system = SYSTEM.lower()
     if 'linux' in system:
-        if 'arm' in platform.machine().lower():
+        if 'arm' in MACHINE.lower():
             return 'RASPBERRY'
         return 'LINUX'
     elif 'darwin' in system:
@@ -217,31 +401,69 @@ def determine_system_type():
         return 'WINDOWS'
     return 'OTHER'
 
-def get_linux_drive_type(device_path):
+# Disk name prefixes whose partitions are numbered directly after a letter (sda1)
+LETTER_DISK_PREFIXES = ('sd', 'hd', 'vd', 'xvd')
+
+def get_physical_device(device):
+    """
+    Map a Linux partition to its whole-disk device, e.g. /dev/sda1 -> /dev/sda
+    and /dev/nvme0n1p2 -> /dev/nvme0n1. Whole devices (/dev/md0, /dev/sr0, ...)
+    map to themselves; when sysfs knows the device, symlinks are resolved to the
+    kernel name (/dev/mapper/vg-root -> /dev/dm-0) so its queue can be read.
+    Returns None for non-/dev devices.
+    """
+    if not device.startswith('/dev/'):
+        return None
+    
+    # Ask sysfs whether this is a partition and which disk it belongs to, the
+    # same way generate_config.get_rotational_device_type finds the parent disk
+    name = os.path.basename(os.path.realpath(device))
+    sys_path = f'/sys/class/block/{name}'
+    if os.path.exists(sys_path):
+        if os.path.exists(f'{sys_path}/partition'):
+            return '/dev/' + os.path.basename(os.path.realpath(f'{sys_path}/..'))
+        return f'/dev/{name}'
+    
+    # No sysfs entry (e.g. in a container): fall back to naming conventions.
+    # Disks whose names end in a digit (nvme0n1, mmcblk0, md127, loop0, nbd0)
+    # use a "p" separator before the partition number
+    disk, separator, number = device.rpartition('p')
+    if separator and number.isdigit() and disk[-1:].isdigit():
+        return disk
+    
+    # sd/hd/vd/xvd drives: strip the partition number (sda1 -> sda)
+    if os.path.basename(device).startswith(LETTER_DISK_PREFIXES):
+        disk = device.rstrip('0123456789')
+        if disk != device:
+            return disk
+    return device
+
+@async_cache
+async def get_linux_drive_type(device_path):
     """
     Determine if a Linux device is an SSD or HDD using more reliable methods.
-    Returns "SSD", "HDD", or "unknown"
+    Returns "SSD", "HDD", or "unknown". Results are cached per device, since
+    the drive type only changes if the device is replaced.
     """
     try:
         # Extract the base device name (e.g., sda from /dev/sda1)
-        if '/dev/' in device_path:
-            base_device = re.sub(r'p?\d+$', '', device_path)  # Remove partition number
-            device_name = base_device.split('/')[-1]  # Get just the device name
-        else:
+        base_device = get_physical_device(device_path)
+        if not base_device:
             return "unknown"
+        device_name = base_device.split('/')[-1]  # Get just the device name
             
         # Check rotational flag in sysfs - the most reliable way in Linux
         # 0 means SSD, 1 means HDD
-        rotational_path = f"/sys/block/{device_name}/queue/rotational"
-        if os.path.exists(rotational_path):
-            with open(rotational_path, 'r') as f:
-                rotational = int(f.read().strip())
-                return "HDD" if rotational == 1 else "SSD"
+        try:
+            with open(f"/sys/block/{device_name}/queue/rotational", 'rb') as f:
+                return "HDD" if f.read(2).startswith(b'1') else "SSD"
+        except OSError:
+            pass
                 
         # Try by using SMART data
         try:
             cmd = ['smartctl', '-i', base_device]
-            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT).decode('utf-8').lower()
+            output = (await run_command(cmd, merge_stderr=True)).lower()
             
             # Check for SSD indicators in SMART output
             if 'solid state device' in output or 'ssd' in output:
@@ -264,6 +486,57 @@ def get_linux_drive_type(device_path):
         logger.error(f"Error determining drive type: {e}")
         return "unknown"
 
+@functools.lru_cache(maxsize=None)
+def get_storage_device_id(mountpoint):
+    """Get a storage device ID that stays the same across reconnects and restarts"""
+    # Keyed on the mount point rather than /dev name, which can change between boots
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{CLIENT_ID}|{mountpoint}"))
+
+# The mount table rarely changes, so reuse it for this many seconds
+PARTITION_CACHE_TTL = 60
+
+_partitions = None
+_partitions_time = 0.0
+
+def get_disk_partitions():
+    """Get mounted physical partitions, shared by registration and metrics collection"""
+    global _partitions, _partitions_time
+    now = time.monotonic()
+    if _partitions is None or now - _partitions_time > PARTITION_CACHE_TTL:
+        _partitions = psutil.disk_partitions(all=False)
+        _partitions_time = now
+    return _partitions
+
+async def get_disk_usage(mountpoint):
+    """
+    psutil.disk_usage with a DISK_USAGE_TIMEOUT deadline. Raises TimeoutError if
+    the call doesn't return in time, or if an earlier call for the same mountpoint
+    is still stuck, rather than tying up a worker thread.
+    """
+    future = start_guarded(f"disk_usage:{mountpoint}", psutil.disk_usage, mountpoint)
+    if future is None:
+        raise TimeoutError(f"previous disk usage query for {mountpoint} hasn't returned")
+    
+    done, _ = await asyncio.wait({future}, timeout=DISK_USAGE_TIMEOUT)
+    if not done:
+        raise TimeoutError(f"disk usage for {mountpoint} didn't return within {DISK_USAGE_TIMEOUT} seconds")
+    return future.result()
+
+# macOS volumes that aren't real user-facing drives
+MACOS_SKIP_PATTERNS = (
+    '/Library/Developer/CoreSimulator',
+    '/Volumes/com.apple',
+    '/private/var/vm',
+    '/System/Volumes/VM',
+    '/System/Volumes/Preboot',
+    '/System/Volumes/Data',
+    '/System/Volumes/Update',
+    'TimeMachine'
+)
+
+# Mountpoints containing any of these are system partitions, not primary storage
+SYSTEM_PARTITION_NAMES = ("boot", "efi", "recovery", "system")
+
 async def collect_storage_devices():
     """Collect information about storage devices"""
     try:
@@ -287,10 +560,10 @@ async def collect_storage_devices():
             # Only check configured mountpoints
             for mountpoint, config_type in config_devices:
                 try:
-                    usage = psutil.disk_usage(mountpoint)
+                    usage = await get_disk_usage(mountpoint)
                     
                     storage_devices.append({
-                        "id": str(uuid.uuid4()),
+                        "id": get_storage_device_id(mountpoint),
                         "name": mountpoint,
                         "device_type": config_type,
                         "total_bytes": usage.total,
@@ -303,28 +576,19 @@ async def collect_storage_devices():
             return storage_devices
             
         # If no configuration, proceed with default detection
-        for partition in psutil.disk_partitions(all=False):
+        for partition in await asyncio.to_thread(get_disk_partitions):
             # Skip certain filesystem types and small partitions
             if partition.fstype == '' or partition.fstype == 'squashfs':
                 continue
                 
             # Skip EFI partitions by mount point
-            if 'efi' in partition.mountpoint.lower() or 'boot/efi' in partition.mountpoint.lower():
+            if 'efi' in partition.mountpoint.lower():
                 continue
                 
             # macOS specific filtering
-            if platform.system() == 'Darwin':
+            if SYSTEM == 'Darwin':
                 # Skip iOS/watchOS simulator volumes, development volumes, and other non-physical drives
-                if any(skip_pattern in partition.mountpoint for skip_pattern in [
-                    '/Library/Developer/CoreSimulator',
-                    '/Volumes/com.apple',
-                    '/private/var/vm',
-                    '/System/Volumes/VM',
-                    '/System/Volumes/Preboot',
-                    '/System/Volumes/Data',
-                    '/System/Volumes/Update',
-                    'TimeMachine'
-                ]):
+                if any(skip_pattern in partition.mountpoint for skip_pattern in MACOS_SKIP_PATTERNS):
                     logger.debug(f"Skipping macOS special volume: {partition.mountpoint}")
                     continue
                 
@@ -339,20 +603,11 @@ async def collect_storage_devices():
             # Extract the physical device identifier - platform specific approach
             physical_device = None
             
-            if platform.system() == 'Linux':
+            if SYSTEM == 'Linux':
                 # For Linux, extract the physical device name from the partition name
-                if 'nvme' in device.lower():
-                    # Handle NVMe drives which use a different naming scheme
-                    match = re.match(r'(/dev/nvme[0-9]+n[0-9]+)p?[0-9]*', device)
-                    if match:
-                        physical_device = match.group(1)
-                else:
-                    # Standard drives like /dev/sda1 -> /dev/sda
-                    match = re.match(r'(/dev/[a-zA-Z]+)[0-9]*', device)
-                    if match:
-                        physical_device = match.group(1)
+                physical_device = get_physical_device(device)
             
-            elif platform.system() == 'Darwin':  # macOS
+            elif SYSTEM == 'Darwin':  # macOS
                 # For macOS, use diskutil to map the device to its physical disk
                 try:
                     # For macOS, set device type more accurately
@@ -363,7 +618,7 @@ async def collect_storage_devices():
                         # Check if it's a real physical drive and what type
                         try:
                             cmd = ['diskutil', 'info', partition.mountpoint]
-                            output = subprocess.check_output(cmd).decode('utf-8').lower()
+                            output = (await run_command(cmd)).lower()
                             
                             # Look for indicators of drive type
                             if any(ssd_indicator in output for ssd_indicator in ['solid state', 'ssd']):
@@ -384,10 +639,10 @@ async def collect_storage_devices():
                         
                         # Run diskutil info to get the parent disk
                         cmd = ['diskutil', 'info', disk_id]
-                        output = subprocess.check_output(cmd).decode('utf-8')
+                        output = await run_command(cmd)
                         
                         # Look for "Part of Whole" to find the physical disk
-                        for line in output.split('\n'):
+                        for line in output.splitlines():
                             if "Part of Whole:" in line:
                                 parent_disk = line.split(':', 1)[1].strip()
                                 physical_device = f"/dev/{parent_disk}"
@@ -408,7 +663,7 @@ async def collect_storage_devices():
                     # If diskutil fails, use the device as is
                     physical_device = device or partition.mountpoint
             
-            elif platform.system() == 'Windows':
+            elif SYSTEM == 'Windows':
                 # Windows devices are already drive letters (C:, D:, etc.)
                 physical_device = device
             
@@ -421,14 +676,15 @@ async def collect_storage_devices():
                 # Determine device type based on the platform
                 device_type = "unknown"
                 
-                if platform.system() == 'Linux':
+                if SYSTEM == 'Linux':
                     # Use our enhanced Linux device type detection
-                    device_type = get_linux_drive_type(physical_device)
+                    device_type = await get_linux_drive_type(physical_device)
                 else:
                     # Fallback for other platforms
-                    if "ssd" in device.lower() or "nvme" in device.lower() or "flash" in device.lower():
+                    device_lower = device.lower()
+                    if "ssd" in device_lower or "nvme" in device_lower or "flash" in device_lower:
                         device_type = "SSD"
-                    elif "sd" in device.lower() or "hd" in device.lower():
+                    elif "sd" in device_lower or "hd" in device_lower:
                         device_type = "HDD"
                 
                 physical_devices[physical_device] = {
@@ -438,7 +694,7 @@ async def collect_storage_devices():
                 }
             
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
+                usage = await get_disk_usage(partition.mountpoint)
                 
                 # Skip tiny partitions (less than 1GB generally indicates boot partitions or recovery partitions)
                 if usage.total < 1e9:
@@ -455,6 +711,10 @@ async def collect_storage_devices():
                 # Some mount points might not be accessible
                 logger.debug(f"Permission error accessing: {partition.mountpoint}")
                 continue
+            except TimeoutError as e:
+                # A hung mount (e.g. a dead network share) is left out of registration
+                logger.warning(f"Skipping {partition.mountpoint}: {e}")
+                continue
         
         # Second pass: Create the final storage devices list
         # Only include primary mount points for each physical device
@@ -463,29 +723,29 @@ async def collect_storage_devices():
             if not device_info["partitions"]:
                 continue
                 
-            # Find main partitions - typically the largest ones or root partitions
+            # Find main partitions - the root partition (listed first) plus other
+            # significant, non-system partitions, in a single pass
             primary_partitions = []
+            root_found = False
             
-            # First check for root partition
-            root_partition = next((p for p in device_info["partitions"] 
-                                  if p["mountpoint"] == "/" or p["mountpoint"] == "C:"), None)
-                
-            if root_partition:
-                primary_partitions.append(root_partition)
-            
-            # Then add other significant partitions (non-system partitions)
             for partition in device_info["partitions"]:
-                # Skip if already added as root
-                if root_partition and partition["mountpoint"] == root_partition["mountpoint"]:
+                mountpoint = partition["mountpoint"]
+                
+                # Root partition goes first; any duplicate mount of it is skipped
+                if mountpoint == "/" or mountpoint == "C:":
+                    if not root_found:
+                        primary_partitions.insert(0, partition)
+                        root_found = True
                     continue
                     
                 # Skip system-related partitions
-                if any(name in partition["mountpoint"].lower() for name in ["boot", "efi", "recovery", "system"]):
+                mountpoint_lower = mountpoint.lower()
+                if any(name in mountpoint_lower for name in SYSTEM_PARTITION_NAMES):
                     continue
                 
                 # For macOS, only add real volumes (root and /Volumes)
-                if platform.system() == 'Darwin':
-                    if partition.mountpoint == '/' or partition.mountpoint.startswith('/Volumes/'):
+                if SYSTEM == 'Darwin':
+                    if mountpoint.startswith('/Volumes/'):
                         primary_partitions.append(partition)
                 else:
                     # For other OSes, add all significant partitions
@@ -494,7 +754,7 @@ async def collect_storage_devices():
             # Create storage device entries for each primary partition
             for partition in primary_partitions:
                 storage_devices.append({
-                    "id": str(uuid.uuid4()),
+                    "id": get_storage_device_id(partition["mountpoint"]),
                     "name": partition["mountpoint"],
                     "device_type": device_info["device_type"],
                     "total_bytes": partition["total_bytes"],
@@ -510,6 +770,18 @@ async def collect_storage_devices():
         logger.error(f"Error collecting storage devices: {e}")
         return []
 
+# Loopback and container/overlay virtual interfaces that aren't worth reporting
+SKIPPED_INTERFACE_PREFIXES = ('lo', 'veth', 'docker', 'br-', 'cni', 'cali', 'flannel')
+
+def is_monitored_interface(interface_name):
+    """Check whether an interface should be reported when none are configured"""
+    return not interface_name.startswith(SKIPPED_INTERFACE_PREFIXES)
+
+def interface_is_up(net_if_stats, interface_name):
+    """Look up an interface's up/down state in psutil.net_if_stats() output"""
+    stats = net_if_stats.get(interface_name)
+    return stats.isup if stats else False
+
 async def collect_network_interfaces():
     """Collect information about network interfaces"""
     try:
@@ -526,8 +798,10 @@ async def collect_network_interfaces():
                     logger.debug(f"Config: Network interface {interface_name}")
             
             # Only check interfaces in config
-            net_if_addrs = psutil.net_if_addrs()
-            net_if_stats = psutil.net_if_stats()
+            net_if_addrs, net_if_stats = await asyncio.gather(
+                asyncio.to_thread(psutil.net_if_addrs),
+                asyncio.to_thread(psutil.net_if_stats)
+            )
             
             for interface_name in config_interfaces:
                 if interface_name in net_if_addrs:
@@ -538,7 +812,7 @@ async def collect_network_interfaces():
                         "name": interface_name,
                         "mac_address": "",
                         "ip_address": None,
-                        "is_up": interface_name in net_if_stats and net_if_stats[interface_name].isup
+                        "is_up": interface_is_up(net_if_stats, interface_name)
                     }
                     
                     # Get MAC address and IP
@@ -557,22 +831,24 @@ async def collect_network_interfaces():
             return network_interfaces
             
         # If no configuration, proceed with default detection
-        net_if_addrs = psutil.net_if_addrs()
-        net_if_stats = psutil.net_if_stats()
+        net_if_addrs, net_if_stats = await asyncio.gather(
+            asyncio.to_thread(psutil.net_if_addrs),
+            asyncio.to_thread(psutil.net_if_stats)
+        )
         
         # Debug log all interfaces found
         if logger.isEnabledFor(logging.DEBUG):
             for name, addrs in net_if_addrs.items():
                 ip_addr = next((addr.address for addr in addrs if addr.family == socket.AF_INET), "No IP")
                 mac_addr = next((addr.address for addr in addrs if getattr(addr, 'family', None) == psutil.AF_LINK), "No MAC")
-                is_up = name in net_if_stats and net_if_stats[name].isup
+                is_up = interface_is_up(net_if_stats, name)
                 logger.debug(f"Found interface: {name}, IP: {ip_addr}, MAC: {mac_addr}, UP: {is_up}")
         
         # Process interfaces - ONLY include those with IP addresses
         for interface_name, interface_addresses in net_if_addrs.items():
-            # Skip loopback interfaces explicitly
-            if interface_name.startswith('lo') or interface_name.startswith('veth'):
-                logger.debug(f"Skipping loopback interface: {interface_name}")
+            # Skip loopback and virtual interfaces explicitly
+            if not is_monitored_interface(interface_name):
+                logger.debug(f"Skipping loopback/virtual interface: {interface_name}")
                 continue
                 
             # Initialize interface info
@@ -580,7 +856,7 @@ async def collect_network_interfaces():
                 "name": interface_name,
                 "mac_address": "",
                 "ip_address": None,
-                "is_up": interface_name in net_if_stats and net_if_stats[interface_name].isup
+                "is_up": interface_is_up(net_if_stats, interface_name)
             }
             
             # Get MAC address
@@ -613,130 +889,161 @@ async def collect_network_interfaces():
         logger.error(f"Error collecting network interfaces: {e}")
         return []
 
+async def read_guarded(name, reader):
+    """Run a blocking metrics reader with a deadline
+
+    Returns {} if the reader doesn't finish within METRICS_COLLECT_TIMEOUT, or if
+    its call from an earlier tick still hasn't returned.
+    """
+    future = start_guarded(name, reader)
+    if future is None:
+        logger.warning(f"Skipping {name} metrics: previous read hasn't returned")
+        return {}
+    
+    done, _ = await asyncio.wait({future}, timeout=METRICS_COLLECT_TIMEOUT)
+    if not done:
+        logger.warning(f"Reading {name} metrics took longer than {METRICS_COLLECT_TIMEOUT} seconds, skipping")
+        return {}
+    return future.result()
+
 async def collect_metrics():
-    """Collect current system metrics"""
+    """Collect current system metrics without blocking the event loop"""
+    # Read each subsystem separately with its own deadline so a slow one (e.g. a
+    # stalled network mount in disk_usage) only drops its own metrics from the tick
+    results = await asyncio.gather(
+        read_guarded("system", read_system_metrics),
+        collect_storage_metrics(),
+        read_guarded("network", read_network_metrics)
+    )
+    
+    metrics = {}
+    for result in results:
+        metrics.update(result)
+    return metrics
+
+# Static unit/type/category fields for each kind of metric; only the value
+# (and the device/interface label) changes from tick to tick
+METRIC_TEMPLATES = {
+    "cpu_usage": {"unit": "%", "data_type": "FLOAT", "category": "CPU"},
+    "memory_used": {"unit": "bytes", "data_type": "INT", "category": "MEMORY"},
+    "memory_percent": {"unit": "%", "data_type": "FLOAT", "category": "MEMORY"},
+    "swap_used": {"unit": "bytes", "data_type": "INT", "category": "MEMORY"},
+    "swap_percent": {"unit": "%", "data_type": "FLOAT", "category": "MEMORY"},
+    "boot_time": {"unit": "timestamp", "data_type": "INT", "category": "SYSTEM"},
+    "process_count": {"unit": "count", "data_type": "INT", "category": "SYSTEM"},
+    "load_avg": {"unit": "load", "data_type": "FLOAT", "category": "SYSTEM"},
+    "disk_used": {"unit": "bytes", "data_type": "INT", "category": "STORAGE"},
+    "disk_percent": {"unit": "%", "data_type": "FLOAT", "category": "STORAGE"},
+    "net_bytes_sent": {"unit": "bytes", "data_type": "INT", "category": "NETWORK"},
+    "net_bytes_recv": {"unit": "bytes", "data_type": "INT", "category": "NETWORK"},
+}
+
+def new_metric(kind, value, **labels):
+    """Build a metric entry from its template in METRIC_TEMPLATES"""
+    return {"value": value, **METRIC_TEMPLATES[kind], **labels}
+
+def read_system_metrics():
+    """Read CPU, memory and system metrics (blocking; runs in a worker thread)"""
     try:
-        # Basic system metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # Basic system metrics (CPU usage is averaged over the time since the last tick)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         swap = psutil.swap_memory()
         
         # Create metrics dictionary
         metrics = {
-            "cpu_usage": {
-                "value": cpu_percent,
-                "unit": "%",
-                "data_type": "FLOAT",
-                "category": "CPU"
-            },
-            "memory_used": {
-                "value": memory.used,
-                "unit": "bytes",
-                "data_type": "INT",
-                "category": "MEMORY"
-            },
-            "memory_percent": {
-                "value": memory.percent,
-                "unit": "%",
-                "data_type": "FLOAT",
-                "category": "MEMORY"
-            },
-            "swap_used": {
-                "value": swap.used,
-                "unit": "bytes",
-                "data_type": "INT",
-                "category": "MEMORY"
-            },
-            "swap_percent": {
-                "value": swap.percent,
-                "unit": "%",
-                "data_type": "FLOAT",
-                "category": "MEMORY"
-            },
-            "boot_time": {
-                "value": psutil.boot_time(),
-                "unit": "timestamp",
-                "data_type": "INT",
-                "category": "SYSTEM"
-            },
-            "process_count": {
-                "value": len(psutil.pids()),
-                "unit": "count",
-                "data_type": "INT",
-                "category": "SYSTEM"
-            }
+            "cpu_usage": new_metric("cpu_usage", cpu_percent),
+            "memory_used": new_metric("memory_used", memory.used),
+            "memory_percent": new_metric("memory_percent", memory.percent),
+            "swap_used": new_metric("swap_used", swap.used),
+            "swap_percent": new_metric("swap_percent", swap.percent),
+            "boot_time": new_metric("boot_time", BOOT_TIME),
+            "process_count": new_metric("process_count", len(psutil.pids()))
         }
         
         # Add load averages on Unix systems
         if hasattr(psutil, "getloadavg"):
             load1, load5, load15 = psutil.getloadavg()
-            metrics["load_avg_1min"] = {
-                "value": load1,
-                "unit": "load",
-                "data_type": "FLOAT",
-                "category": "SYSTEM"
-            }
-            metrics["load_avg_5min"] = {
-                "value": load5,
-                "unit": "load",
-                "data_type": "FLOAT",
-                "category": "SYSTEM"
-            }
-            metrics["load_avg_15min"] = {
-                "value": load15,
-                "unit": "load",
-                "data_type": "FLOAT",
-                "category": "SYSTEM"
-            }
+            metrics["load_avg_1min"] = new_metric("load_avg", load1)
+            metrics["load_avg_5min"] = new_metric("load_avg", load5)
+            metrics["load_avg_15min"] = new_metric("load_avg", load15)
         
-        # Add disk usage for each partition
-        for partition in psutil.disk_partitions(all=False):
+        return metrics
+    except Exception as e:
+        logger.error(f"Error collecting system metrics: {e}")
+        return {}
+
+async def collect_storage_metrics():
+    """Collect disk usage for each partition, querying the partitions concurrently
+
+    Each disk_usage is a statvfs that can stall on a spun-down or network disk.
+    Partitions that don't answer within DISK_USAGE_TIMEOUT, or fail, are left out
+    of this tick; the rest are still reported. A mountpoint whose earlier query
+    is still stuck isn't queried again until that call returns.
+    """
+    try:
+        metrics = {}
+        
+        partitions = await asyncio.to_thread(get_disk_partitions)
+        futures = {}
+        for partition in partitions:
+            future = start_guarded(f"disk_usage:{partition.mountpoint}", psutil.disk_usage, partition.mountpoint)
+            if future is None:
+                logger.debug("Skipping %s: previous disk usage query hasn't returned", partition.mountpoint)
+                continue
+            futures[partition.mountpoint] = future
+        
+        if futures:
+            _, late = await asyncio.wait(futures.values(), timeout=DISK_USAGE_TIMEOUT)
+            for mountpoint, future in futures.items():
+                if future in late:
+                    logger.warning(f"Disk usage for {mountpoint} didn't return within {DISK_USAGE_TIMEOUT} seconds, skipping")
+        
+        # Add disk usage for each partition that answered in time
+        for partition in partitions:
+            future = futures.get(partition.mountpoint)
+            if future is None or not future.done():
+                continue
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                partition_name = partition.mountpoint.replace(':', '').replace('\\', '/').replace(' ', '_')
-                
-                metrics[f"disk_used_{partition_name}"] = {
-                    "value": usage.used,
-                    "unit": "bytes",
-                    "data_type": "INT",
-                    "category": "STORAGE",
-                    "storage_device": partition.mountpoint
-                }
-                metrics[f"disk_percent_{partition_name}"] = {
-                    "value": usage.percent,
-                    "unit": "%",
-                    "data_type": "FLOAT",
-                    "category": "STORAGE",
-                    "storage_device": partition.mountpoint
-                }
+                usage = future.result()
             except (PermissionError, FileNotFoundError):
                 continue
+            except Exception as e:
+                logger.warning(f"Error reading disk usage for {partition.mountpoint}: {e}")
+                continue
+            
+            partition_name = partition.mountpoint.replace(':', '').replace('\\', '/').replace(' ', '_')
+            
+            metrics[f"disk_used_{partition_name}"] = new_metric(
+                "disk_used", usage.used, storage_device=partition.mountpoint)
+            metrics[f"disk_percent_{partition_name}"] = new_metric(
+                "disk_percent", usage.percent, storage_device=partition.mountpoint)
+        
+        return metrics
+    except Exception as e:
+        logger.error(f"Error collecting storage metrics: {e}")
+        return {}
+
+def read_network_metrics():
+    """Read network IO counters (blocking; runs in a worker thread)"""
+    try:
+        metrics = {}
         
         # Add network IO counters
         net_io = psutil.net_io_counters(pernic=True)
         for interface, counters in net_io.items():
-            # Skip loopback interfaces
-            if interface.startswith('lo') or interface.startswith('veth'):
+            # Skip loopback and virtual interfaces
+            if not is_monitored_interface(interface):
                 continue
                 
-            metrics[f"net_bytes_sent_{interface}"] = {
-                "value": counters.bytes_sent,
-                "unit": "bytes",
-                "data_type": "INT",
-                "category": "NETWORK",
-                "network_interface": interface
-            }
-            metrics[f"net_bytes_recv_{interface}"] = {
-                "value": counters.bytes_recv,
-                "unit": "bytes",
-                "data_type": "INT",
-                "category": "NETWORK",
-                "network_interface": interface
-            }
+            metrics[f"net_bytes_sent_{interface}"] = new_metric(
+                "net_bytes_sent", counters.bytes_sent, network_interface=interface)
+            metrics[f"net_bytes_recv_{interface}"] = new_metric(
+                "net_bytes_recv", counters.bytes_recv, network_interface=interface)
         
         return metrics
     except Exception as e:
-        logger.error(f"Error collecting metrics: {e}")
+        logger.error(f"Error collecting network metrics: {e}")
         return {}
 
 async def register_host(websocket):
@@ -744,32 +1051,21 @@ async def register_host(websocket):
     try:
         logger.info(f"Beginning host registration process for {HOSTNAME}...")
         
-        # Collect system information
-        logger.info("Collecting system information...")
-        system_info = await collect_system_info()
-        
-        # Get the fields we need to explicitly add at the root level
-        explicit_client_id = system_info.get("client_id", CLIENT_ID)
-        explicit_short_name = system_info.get("short_name", "")
-        explicit_description = system_info.get("description", "")
-        
-        logger.info("Collecting storage device information...")
-        storage_devices = await collect_storage_devices()
-        
-        logger.info("Collecting network interface information...")
-        network_interfaces = await collect_network_interfaces()
+        # Collect system, storage and network information concurrently
+        logger.info("Collecting system, storage device and network interface information...")
+        system_info, storage_devices, network_interfaces = await asyncio.gather(
+            collect_system_info(),
+            collect_storage_devices(),
+            collect_network_interfaces()
+        )
         
-        # Create registration message with explicit fields at root level
+        # Create registration message with explicit client_id/short_name/description at root level
         registration_message = {
-            "type": "register_host",
-            "hostname": HOSTNAME,
-            "client_id": explicit_client_id,
-            "short_name": explicit_short_name,
-            "description": explicit_description,
+            **REGISTRATION_ENVELOPE,
             "system_info": system_info,
             "storage_devices": storage_devices,
             "network_interfaces": network_interfaces,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
         
         # Log the exact message structure we're sending
@@ -777,9 +1073,10 @@ async def register_host(websocket):
                    f"short_name='{registration_message['short_name']}', " +
                    f"description='{registration_message['description']}'")
         
-        # Send registration message
-        logger.info(f"Sending registration data to server")
-        await websocket.send(json.dumps(registration_message))
+        # Send registration message, serialized once so its size can be logged
+        payload = encode_message(registration_message)
+        logger.info("Sending registration data to server (%d bytes)", len(payload))
+        await websocket.send(payload, text=True)
         logger.info(f"Registration data sent successfully")
         
         # Wait for confirmation
@@ -787,12 +1084,12 @@ async def register_host(websocket):
         
         # Set a reasonable timeout
         max_wait_time = 10  # seconds
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while time.time() - start_time < max_wait_time:
+        while time.monotonic() - start_time < max_wait_time:
             try:
                 response = await asyncio.wait_for(websocket.recv(), timeout=2.0)
-                response_data = json.loads(response)
+                response_data = decode_message(response)
                 
                 logger.info(f"Received response: {response_data.get('type')}")
                 
@@ -809,43 +1106,57 @@ async def register_host(websocket):
         logger.error(f"❌ Error during host registration: {e}")
         return False
 
-async def send_metrics(websocket):
-    """Send metrics to the monitoring server"""
-    try:
-        start_time = time.time()
-        logger.debug(f"Collecting metrics for {HOSTNAME}...")
-        
-        # Check if websocket is still open using a safer method that doesn't rely on internal attributes
-        # We'll just proceed and let the send operation handle any connection issues
-        
-        # Collect metrics
-        metrics = await collect_metrics()
-        
-        # Count metrics by category
-        categories = {}
-        for key, metric in metrics.items():
-            category = metric.get("category", "OTHER")
-            if category not in categories:
-                categories[category] = 0
-            categories[category] += 1
-        
-        categories_str = ", ".join([f"{cat}: {count}" for cat, count in categories.items()])
-        logger.info(f"Sending {len(metrics)} metrics ({categories_str})")
+async def produce_metrics(queue, interval):
+    """Collect metrics every interval seconds and queue them for sending
+
+    Runs independently of the sender so a slow or stalled connection doesn't
+    delay sampling. When the queue is full the oldest sample is dropped.
+    """
+    # Schedule ticks against the loop's monotonic clock so the time spent
+    # collecting doesn't stretch the interval
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    while True:
+        try:
+            logger.debug("Collecting metrics for %s...", HOSTNAME)
+            metrics = await collect_metrics()
+            metrics_message = {
+                **METRICS_ENVELOPE,
+                "metrics": metrics,
+                "timestamp": datetime.now()
+            }
+            
+            if queue.full():
+                queue.get_nowait()
+                logger.warning("Metrics queue full, dropping oldest sample")
+            queue.put_nowait(metrics_message)
+        except Exception as e:
+            logger.error(f"Error collecting metrics: {e}")
         
-        # Create metrics message
-        metrics_message = {
-            "type": "metrics_update",
-            "hostname": HOSTNAME,
-            "metrics": metrics,
-            "timestamp": datetime.now().isoformat()
-        }
+        # Wait until the next tick is due
+        next_tick += interval
+        delay = next_tick - loop.time()
+        if delay < 0:
+            # Fell behind by a whole interval; resync rather than bursting to catch up
+            next_tick = loop.time()
+            delay = 0
+        await asyncio.sleep(delay)
+
+async def send_metrics(websocket, metrics_message):
+    """Send a collected metrics message to the monitoring server"""
+    try:
+        start_time = time.monotonic()
         
         # Send metrics message - this will fail if the connection is closed
-        await websocket.send(json.dumps(metrics_message))
+        await websocket.send(encode_message(metrics_message), text=True)
         
-        # Calculate elapsed time
-        elapsed = time.time() - start_time
-        logger.info(f"Metrics sent successfully in {elapsed:.2f} seconds")
+        # Log a single line per tick, and only build the per-category summary if it will be emitted
+        if logger.isEnabledFor(logging.INFO):
+            metrics = metrics_message["metrics"]
+            categories = Counter(metric.get("category", "OTHER") for metric in metrics.values())
+            categories_str = ", ".join(f"{cat}: {count}" for cat, count in categories.items())
+            logger.info("Sent %d metrics (%s) in %.2f seconds",
+                        len(metrics), categories_str, time.monotonic() - start_time)
         
         return True
     except websockets.exceptions.ConnectionClosed as e:
@@ -858,12 +1169,31 @@ async def send_metrics(websocket):
             return False
         return True
 
+async def read_server_messages(websocket):
+    """Read and log messages the server sends after registration
+
+    Nothing else reads from the connection once the host is registered. Unread
+    frames pile up until websockets stops reading the socket altogether, at which
+    point keepalive pongs go unseen and the connection is dropped.
+    """
+    try:
+        async for message in websocket:
+            try:
+                message_type = decode_message(message).get("type")
+            except (ValueError, AttributeError):
+                logger.debug("Ignoring unrecognized message from server")
+                continue
+            logger.debug("Received %s from server", message_type)
+    except websockets.exceptions.ConnectionClosed:
+        # The metrics loop notices the closed connection on its next send
+        pass
+
 async def monitor_system():
     """Main monitoring function"""
     reconnect_delay = 5  # seconds
     metrics_interval = 10  # seconds
     connection_attempts = 0
-    max_backoff = 60  # Maximum reconnect delay in seconds
+    max_backoff = 300  # Maximum reconnect delay in seconds
     
     # Initial delay to allow system to fully boot before connecting
     if os.path.exists("/.dockerenv"):
@@ -873,6 +1203,11 @@ async def monitor_system():
         # We're on a physical system, wait longer
         initial_delay = 5
     
+    # Bound the worker threads used by asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_WORKER_THREADS, thread_name_prefix='blocking')
+    )
+    
     logger.info(f"Starting monitor in {initial_delay} seconds...")
     await asyncio.sleep(initial_delay)
     
@@ -880,9 +1215,11 @@ async def monitor_system():
         try:
             # Implement exponential backoff for reconnection attempts
             if connection_attempts > 0:
-                # Calculate backoff time (min of 5 * 2^attempts and max_backoff)
+                # Calculate backoff time (min of 5 * 2^attempts and max_backoff), plus up to
+                # 30% jitter so clients don't all reconnect at once when the server comes back
                 current_delay = min(reconnect_delay * (2 ** (connection_attempts - 1)), max_backoff)
-                logger.info(f"Connection attempt {connection_attempts}, backing off for {current_delay} seconds")
+                current_delay += random.uniform(0, current_delay * 0.3)
+                logger.info(f"Connection attempt {connection_attempts}, backing off for {current_delay:.1f} seconds")
                 await asyncio.sleep(current_delay)
             
             connection_attempts += 1
@@ -890,14 +1227,23 @@ async def monitor_system():
             
             try:
                 # Using context manager for websocket connection (automatically closes when exiting the context)
-                async with websockets.connect(WEBSOCKET_URL) as websocket:
+                # compression and max_size restate websockets' defaults (permessage-deflate,
+                # 1 MiB incoming limit) so the client doesn't silently change if they do.
+                # Protocol-level pings detect a half-open connection within ~25 seconds.
+                async with websockets.connect(
+                    WEBSOCKET_URL,
+                    compression="deflate",
+                    max_size=2**20,
+                    ping_interval=15,
+                    ping_timeout=10,
+                    close_timeout=5,
+                ) as websocket:
                     logger.info("✅ WebSocket connection established")
-                    connection_attempts = 0  # Reset counter on successful connection
                     
                     # First receive the welcome message if it exists
                     try:
                         welcome = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                        welcome_data = json.loads(welcome)
+                        welcome_data = decode_message(welcome)
                         logger.info(f"Received initial message: {welcome_data}")
                     except (asyncio.TimeoutError, Exception) as e:
                         logger.warning(f"No initial message received or error: {e}")
@@ -908,47 +1254,58 @@ async def monitor_system():
                         logger.error("Failed to register host. Will reconnect...")
                         continue
                     
-                    # Start sending metrics
+                    connection_attempts = 0  # Reset counter once the server has accepted us
+                    
+                    # Collect on a fixed schedule in a separate task and send whatever it queues,
+                    # so a slow connection delays delivery but not sampling
+                    queue = asyncio.Queue(maxsize=METRICS_QUEUE_SIZE)
+                    producer = asyncio.create_task(produce_metrics(queue, metrics_interval))
+                    # Consume whatever the server sends from now on, so unread replies can't
+                    # back up the connection and stall keepalive pongs
+                    reader = asyncio.create_task(read_server_messages(websocket))
                     send_count = 0
                     failure_count = 0
-                    while True:
-                        try:
-                            # Ping the server to verify connection is still alive
+                    try:
+                        while True:
                             try:
-                                # Send a small ping (some servers might not support actual websocket pings)
-                                ping_message = {"type": "ping", "timestamp": datetime.now().isoformat()}
-                                await websocket.send(json.dumps(ping_message))
-                                logger.debug("Connection ping sent")
-                            except Exception as e:
-                                logger.error(f"Connection ping failed: {e}")
-                                break
-                                
-                            # Send metrics
-                            send_count += 1
-                            logger.debug(f"Sending metrics batch #{send_count}")
-                            
-                            # Try to send metrics and track failures
-                            sent = await send_metrics(websocket)
-                            if not sent:
-                                failure_count += 1
-                                logger.error(f"Failed to send metrics (failure {failure_count}/3)")
+                                metrics_message = await queue.get()
                                 
-                                # Break after 3 consecutive failures
-                                if failure_count >= 3:
-                                    logger.error("Too many consecutive failures, reconnecting...")
+                                # Ping the server to verify connection is still alive
+                                try:
+                                    # Send a small ping (some servers might not support actual websocket pings)
+                                    ping_message = {**PING_ENVELOPE, "timestamp": datetime.now()}
+                                    await websocket.send(encode_message(ping_message), text=True)
+                                    logger.debug("Connection ping sent")
+                                except Exception as e:
+                                    logger.error(f"Connection ping failed: {e}")
                                     break
-                            else:
-                                # Reset failure count on success
-                                failure_count = 0
-                            
-                            # Wait before sending next update
-                            await asyncio.sleep(metrics_interval)
-                        except websockets.exceptions.ConnectionClosed as e:
-                            logger.error(f"Connection closed during metrics loop: {e}")
-                            break
-                        except Exception as e:
-                            logger.error(f"Error in metrics sending loop: {e}")
-                            break
+                                    
+                                # Send metrics
+                                send_count += 1
+                                logger.debug("Sending metrics batch #%d", send_count)
+                                
+                                # Try to send metrics and track failures
+                                sent = await send_metrics(websocket, metrics_message)
+                                if not sent:
+                                    failure_count += 1
+                                    logger.error(f"Failed to send metrics (failure {failure_count}/3)")
+                                    
+                                    # Break after 3 consecutive failures
+                                    if failure_count >= 3:
+                                        logger.error("Too many consecutive failures, reconnecting...")
+                                        break
+                                else:
+                                    # Reset failure count on success
+                                    failure_count = 0
+                            except websockets.exceptions.ConnectionClosed as e:
+                                logger.error(f"Connection closed during metrics loop: {e}")
+                                break
+                            except Exception as e:
+                                logger.error(f"Error in metrics sending loop: {e}")
+                                break
+                    finally:
+                        producer.cancel()
+                        reader.cancel()
                             
             except websockets.exceptions.InvalidStatusCode as e:
                 logger.error(f"Invalid status code: {e}")
@@ -973,7 +1330,6 @@ async def monitor_system():
 # Main entry point
 if __name__ == "__main__":
     # Parse command-line arguments
-    import argparse
     parser = argparse.ArgumentParser(description="WyanData System Monitor Client")
     parser.add_argument("--server", help="WebSocket server address (e.g., hostname:port)")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
@@ -990,17 +1346,18 @@ if __name__ == "__main__":
         WEBSOCKET_URL = f"ws://{args.server}/ws/system/metrics/"
         logger.info(f"Using server address: {WEBSOCKET_URL}")
     
-    # Ensure we have the required modules
-    import os
-    import glob
-    
-    # Print startup banner
-    print("\n" + "=" * 70)
-    print(f"  WyanData System Monitor Client")
-    print(f"  Host: {HOSTNAME}")
-    print(f"  Server: {WEBSOCKET_URL}")
-    print(f"  Client ID: {CLIENT_ID}")
-    print("=" * 70 + "\n")
+    # Print startup banner as a single block
+    banner = "\n".join([
+        "",
+        "=" * 70,
+        "  WyanData System Monitor Client",
+        f"  Host: {HOSTNAME}",
+        f"  Server: {WEBSOCKET_URL}",
+        f"  Client ID: {CLIENT_ID}",
+        "=" * 70,
+        "",
+    ])
+    print(banner, flush=True)
     
     # Start the monitoring loop
     try:
@@ -1010,5 +1367,4 @@ if __name__ == "__main__":
         print("\nMonitoring stopped. Thank you for using WyanData System Monitor!")
     except Exception as e:
         logger.error(f"Fatal error in monitoring loop: {e}", exc_info=True)
-        import traceback
         traceback.print_exc()
\ No newline at end of file